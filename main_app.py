@@ -7,8 +7,14 @@ import pandas as pd
 from simulation.network_generator import generate_network
 from simulation.disease_model import DiseaseModel
 from simulation.simulator import DiseaseSimulator
+from simulation.mean_field import epidemic_threshold, mean_field_curve, spectral_radius
 from visualization.analytics_plotter import plot_epidemic_curve
-from visualization.threejs_renderer import generate_threejs_html
+from visualization.threejs_renderer import (
+    build_scene_payload,
+    export_replay_html,
+    generate_control_html,
+    generate_threejs_html,
+)
 
 st.set_page_config(
     page_title="NetworkSim: 3D",
@@ -32,11 +38,17 @@ def _select_layout(G, model_type, k_val, p_val):
     return nx.spring_layout(G, dim=3, seed=13, pos=base, iterations=25)
 
 @st.cache_data
-def setup_network(n_pop, model_type, k_val, p_val):
-    G = generate_network(n=n_pop, model=model_type, k=k_val, p=p_val, m=5)
+def setup_network(n_pop, model_type, k_val, p_val, seed):
+    G = generate_network(n=n_pop, model=model_type, seed=seed, k=k_val, p=p_val, m=5)
     pos = _select_layout(G, model_type, k_val, p_val)
     return G, pos
 
+@st.cache_data
+def network_spectrum(n_pop, model_type, k_val, p_val, seed):
+    """Spectral radius depends only on topology, so scrubbing rates reuses it."""
+    G, _ = setup_network(n_pop, model_type, k_val, p_val, seed)
+    return spectral_radius(G)
+
 # --- SESSION STATE MANAGEMENT ---
 if 'sim_data' not in st.session_state:
     st.session_state.sim_data = None
@@ -57,20 +69,35 @@ reset_pressed = col_ctrl2.button("RESET", use_container_width=True)
 # Pause Toggle (Maintains state across reruns)
 is_paused = st.sidebar.toggle("⏸ Pause Animation", value=False)
 
+# Analytic preview: instant expected curve, no stochastic run needed
+preview_mode = st.sidebar.toggle("⚡ Fast Preview", value=False)
+preview_method = st.sidebar.radio(
+    "Preview Method", ["degree", "pair"], horizontal=True,
+    format_func=lambda m: "Mean-Field" if m == "degree" else "Pair Approx.",
+    disabled=not preview_mode
+)
+
 if reset_pressed:
     st.session_state.sim_data = None
     st.rerun()
 
-# 2. Settings Inputs
+# 2. Disease Rates (outside the form so the Fast Preview follows them live)
+st.sidebar.markdown("### 🦠 Disease Rates")
+inf_prob = st.sidebar.slider("Infection Rate", 0.0, 1.0, 0.05)
+rec_prob = st.sidebar.slider("Recovery Rate", 0.0, 1.0, 0.02)
+
+# 3. Settings Inputs
 with st.sidebar.form("sim_config"):
     st.header("Settings")
     n_pop = st.number_input("Population", 50, 3000, 600, 50)
     steps = st.number_input("Duration (Days)", 20, 365, 100)
     
     st.subheader("Disease Model")
-    inf_prob = st.slider("Infection Rate", 0.0, 1.0, 0.05)
-    rec_prob = st.slider("Recovery Rate", 0.0, 1.0, 0.02)
     initial_infected = st.slider("Initial Cases", 1, 50, 5)
+    seed = int(st.number_input(
+        "Random Seed", 0, 2**31 - 1, 42,
+        help="Same seed and settings reproduce the same network and run"
+    ))
 
     with st.expander("Network Topology"):
         model_type = st.selectbox("Model", ["watts_strogatz", "barabasi_albert", "erdos_renyi"])
@@ -85,14 +112,38 @@ st.title("Disease Simulation Model")
 
 # Pre-load network structure (Cached)
 with st.spinner("Generating Network Topology..."):
-    G_preview, pos_preview = setup_network(n_pop, model_type, k_val, p_val)
+    G_preview, pos_preview = setup_network(n_pop, model_type, k_val, p_val, seed)
+
+# Analytic Preview (cheap: ODE integration on the degree distribution)
+if preview_mode:
+    preview_model = DiseaseModel(inf_prob, rec_prob)
+    threshold = epidemic_threshold(
+        G_preview, preview_model, radius=network_spectrum(n_pop, model_type, k_val, p_val, seed)
+    )
+    preview_stats = mean_field_curve(
+        G_preview, preview_model, initial_infected, steps, method=preview_method
+    )
+
+    st.subheader("Fast Preview (Expected Curve)")
+    col_p1, col_p2 = st.columns([1, 3])
+    with col_p1:
+        st.metric("Spectral Radius (λ)", f"{threshold['spectral_radius']:.2f}")
+        st.metric("Estimated R₀", f"{threshold['R0']:.2f}")
+        if threshold["above_threshold"]:
+            st.error(f"Above epidemic threshold (β/γ = {threshold['ratio']:.3f} > 1/λ = {threshold['critical_ratio']:.3f})")
+        else:
+            st.success(f"Below epidemic threshold (β/γ = {threshold['ratio']:.3f} ≤ 1/λ = {threshold['critical_ratio']:.3f})")
+    with col_p2:
+        st.plotly_chart(plot_epidemic_curve(preview_stats), use_container_width=True)
 
 # Handle Simulation Run
-if start_pressed or (apply_settings and st.session_state.sim_data is None):
+# In preview mode only START runs the stochastic simulation
+auto_run = apply_settings and st.session_state.sim_data is None and not preview_mode
+if start_pressed or auto_run:
     with st.spinner("Running Simulation..."):
         # 1. Backend Simulation
         G_run = G_preview.copy()
-        sim = DiseaseSimulator(G_run, DiseaseModel(inf_prob, rec_prob))
+        sim = DiseaseSimulator(G_run, DiseaseModel(inf_prob, rec_prob), seed=seed)
         sim.infect_initial(initial_infected)
         sim.run(max_steps=steps)
         
@@ -103,24 +154,42 @@ if start_pressed or (apply_settings and st.session_state.sim_data is None):
             "stats": sim.stats_history,
             "pos": pos_preview
         }
+        
+        # 3. Serialize the 3D scene once per result; reruns reuse this HTML
+        payload = build_scene_payload(G_run, sim.node_history, pos_preview, sim.stats_history)
+        st.session_state.sim_data["scene_key"] = payload["key"]
+        st.session_state.sim_data["scene_html"] = generate_threejs_html(
+            G_run,
+            sim.node_history,
+            pos_preview,
+            stats_history=sim.stats_history,
+            is_paused=is_paused,
+            height=700,
+            payload=payload
+        )
+        # 4. Standalone offline replay (bundled Three.js, compressed history)
+        st.session_state.sim_data["replay_html"] = export_replay_html(
+            G_run, sim.node_history, pos_preview, sim.stats_history, payload=payload
+        )
+        # 5. Epidemic curve (downsampled, so its size is bounded by run length)
+        st.session_state.sim_data["curve_fig"] = plot_epidemic_curve(sim.stats_history)
 
 # --- RENDERING ---
 if st.session_state.sim_data:
     data = st.session_state.sim_data
     
     # Render 3D View
-    # We pass the 'is_paused' state directly to the renderer
-    html_code = generate_threejs_html(
-        data["G"], 
-        data["history"], 
-        data["pos"], 
-        stats_history=data["stats"], 
-        is_paused=is_paused,
-        height=700
+    # The scene HTML is identical across reruns, so the mounted iframe is kept;
+    # the pause toggle reaches it through a tiny control component instead.
+    components.html(data["scene_html"], height=700)
+    components.html(generate_control_html(data["scene_key"], is_paused), height=0)
+    st.download_button(
+        "💾 Download Offline Replay",
+        data=data["replay_html"],
+        file_name="networksim_replay.html",
+        mime="text/html"
     )
     
-    components.html(html_code, height=700)
-    
     # Analysis Section
     st.subheader("Post-Simulation Analysis")
     col1, col2 = st.columns([1, 3])
@@ -137,7 +206,7 @@ if st.session_state.sim_data:
         """, unsafe_allow_html=True)
     
     with col2:
-        st.plotly_chart(plot_epidemic_curve(data["stats"]), use_container_width=True)
+        st.plotly_chart(data["curve_fig"], use_container_width=True)
 
 else:
     # Placeholder State
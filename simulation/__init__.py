@@ -1,3 +1,10 @@
 from .network_generator import generate_network
 from .disease_model import DiseaseModel
-from .simulator import DiseaseSimulator
\ No newline at end of file
+from .simulator import DiseaseSimulator
+from .mean_field import mean_field_curve, epidemic_threshold
+from .metapopulation import MetapopulationSimulator
+from .transmission import TransmissionTree
+from .batched import BatchedSimulator
+from .calibration import calibrate
+from .sharded import ShardedSimulator
+from .rng import CounterRNG
\ No newline at end of file
@@ -0,0 +1,118 @@
+import networkx as nx
+import numpy as np
+
+from .disease_model import infection_table
+from .rng import CounterRNG, pick_seeds, INFECTION, RECOVERY, SEEDING
+
+# Integer state codes used by the array-based engines
+STATE_CODES = {"S": 0, "I": 1, "R": 2}
+SUSCEPTIBLE, INFECTED, RECOVERED = 0, 1, 2
+
+
+def graph_to_csr(G):
+    """
+    Converts a graph into a CSR adjacency matrix.
+
+    Returns:
+        nodes (list): Node ids in row order.
+        A (scipy.sparse.csr_array): Unweighted adjacency, float32.
+    """
+    nodes = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=np.float32, weight=None, format="csr")
+    return nodes, A
+
+
+class BatchedSimulator:
+    """
+    Runs many SIR simulations of the same graph side by side.
+
+    Each column of the (nodes, batch) state matrix is an independent run
+    with its own infection/recovery probabilities. A susceptible node with
+    m infected neighbours is infected with probability 1 - (1 - beta)^m,
+    the same rule DiseaseSimulator uses. Column j draws from replicate
+    replicates[j] of the seed's streams, so it is bit-identical to
+    DiseaseSimulator(graph, DiseaseModel(beta_j, gamma_j), seed=seed,
+    replicate=replicates[j]).
+    """
+
+    def __init__(self, graph, infection_probs, recovery_probs, seed=None, replicates=None):
+        """
+        Args:
+            graph (nx.Graph): The contact network shared by every run.
+            infection_probs (array): Per-contact transmission probability per run.
+            recovery_probs (array): Per-step recovery probability per run.
+            seed (int): Root seed of the random streams (see rng.CounterRNG).
+            replicates (array): Replicate id of each run (default 0..batch-1).
+        """
+        self.nodes, self.adjacency = graph_to_csr(graph)
+        self.beta = np.asarray(infection_probs, dtype=np.float64)
+        self.gamma = np.asarray(recovery_probs, dtype=np.float64)
+        self.rng = CounterRNG(seed)
+        self.time = 0
+
+        # Original position of each surviving column (see keep())
+        self.ids = np.arange(self.beta.size)
+        if replicates is None:
+            replicates = self.ids
+        self.replicates = np.asarray(replicates, dtype=np.int64)
+        self.state = np.full((len(self.nodes), self.beta.size), SUSCEPTIBLE, dtype=np.int8)
+
+        # p(m) lookup per run, indexed by number of infected neighbours
+        max_degree = int(np.diff(self.adjacency.indptr).max(initial=0))
+        self.tables = np.stack([infection_table(b, max_degree) for b in self.beta]) \
+            if self.beta.size else np.zeros((0, max_degree + 1))
+
+    @property
+    def batch_size(self):
+        return self.ids.size
+
+    def infect_initial(self, count=5):
+        """Infects `count` distinct random nodes in every run."""
+        for col in range(self.batch_size):
+            keys = self._uniforms(col, SEEDING)
+            candidates = np.flatnonzero(self.state[:, col] == SUSCEPTIBLE)
+            self.state[pick_seeds(keys, candidates, count), col] = INFECTED
+
+    def counts(self):
+        """
+        Returns:
+            np.ndarray: (3, batch) array of S, I, R counts per run.
+        """
+        return np.stack([
+            (self.state == SUSCEPTIBLE).sum(axis=0),
+            (self.state == INFECTED).sum(axis=0),
+            (self.state == RECOVERED).sum(axis=0),
+        ])
+
+    def step(self):
+        infected = self.state == INFECTED
+        # Infected neighbour count for every (node, run) in one sparse product
+        pressure = (self.adjacency @ infected.astype(np.float32)).astype(np.int64)
+        p_inf = self.tables[np.arange(self.batch_size), pressure]
+
+        newly_infected = (self.state == SUSCEPTIBLE) & (self._uniform_matrix(INFECTION) < p_inf)
+        newly_recovered = infected & (self._uniform_matrix(RECOVERY) < self.gamma)
+
+        self.state[newly_infected] = INFECTED
+        self.state[newly_recovered] = RECOVERED
+        self.time += 1
+
+    def keep(self, mask):
+        """Drops the runs where mask is False so later steps skip them."""
+        mask = np.asarray(mask, dtype=bool)
+        self.state = np.ascontiguousarray(self.state[:, mask])
+        self.beta = self.beta[mask]
+        self.gamma = self.gamma[mask]
+        self.ids = self.ids[mask]
+        self.replicates = self.replicates[mask]
+        self.tables = self.tables[mask]
+
+    def _uniforms(self, col, stream):
+        """One draw per node for run `col` at the current step."""
+        return self.rng.uniforms(self.replicates[col], self.time, stream, len(self.nodes))
+
+    def _uniform_matrix(self, stream):
+        """(nodes, batch) draws, column j from replicate replicates[j]."""
+        if self.batch_size == 0:
+            return np.empty(self.state.shape)
+        return np.stack([self._uniforms(col, stream) for col in range(self.batch_size)], axis=1)
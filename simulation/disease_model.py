@@ -1,4 +1,15 @@
-import random
+import numpy as np
+
+def infection_table(infection_prob, max_contacts):
+    """
+    Probability of infection given m infected contacts, for m = 0..max_contacts.
+
+    Each contact is an independent trial, so p(m) = 1 - (1 - p)^m. Values are
+    computed with scalar float math so every engine gets bit-identical
+    thresholds for the same probability.
+    """
+    q = 1.0 - float(infection_prob)
+    return np.array([1.0 - q ** m for m in range(int(max_contacts) + 1)], dtype=np.float64)
 
 class DiseaseModel:
     """
@@ -18,10 +29,6 @@ class DiseaseModel:
         self.infection_prob = infection_prob
         self.recovery_prob = recovery_prob
 
-    def should_infect(self):
-        """Returns True if an infection event should occur."""
-        return random.random() < self.infection_prob
-
-    def should_recover(self):
-        """Returns True if a recovery event should occur."""
-        return random.random() < self.recovery_prob
\ No newline at end of file
+    def infection_table(self, max_contacts):
+        """Per-node infection probability indexed by number of infected contacts."""
+        return infection_table(self.infection_prob, max_contacts)
\ No newline at end of file
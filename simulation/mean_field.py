@@ -0,0 +1,188 @@
+import math
+
+import networkx as nx
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse.linalg import eigsh
+
+# Keeps per-step probabilities of exactly 1.0 from producing infinite rates
+_MAX_PROB = 1.0 - 1e-9
+
+
+def _to_rate(prob):
+    """Converts a per-step probability into an equivalent continuous rate."""
+    # 0.0 - x rather than -x, so a zero probability gives +0.0 (not -0.0)
+    return 0.0 - math.log(1.0 - min(max(prob, 0.0), _MAX_PROB))
+
+
+def degree_statistics(G):
+    """
+    Summarizes the degree distribution of the graph.
+
+    Returns:
+        dict: {"degrees": unique degrees k, "counts": N_k per degree,
+               "mean": <k>, "second_moment": <k^2>}
+    """
+    degrees = np.fromiter((d for _, d in G.degree()), dtype=np.int64, count=G.number_of_nodes())
+    if degrees.size == 0:
+        return {"degrees": degrees, "counts": degrees, "mean": 0.0, "second_moment": 0.0}
+
+    counts = np.bincount(degrees)
+    ks = np.nonzero(counts)[0]
+    return {
+        "degrees": ks,
+        "counts": counts[ks],
+        "mean": float(degrees.mean()),
+        "second_moment": float((degrees.astype(np.float64) ** 2).mean()),
+    }
+
+
+def spectral_radius(G):
+    """
+    Returns the largest eigenvalue of the adjacency matrix of G.
+
+    Uses a sparse Lanczos solve, so it stays cheap on large graphs.
+    """
+    n = G.number_of_nodes()
+    if n == 0 or G.number_of_edges() == 0:
+        return 0.0
+
+    A = nx.to_scipy_sparse_array(G, dtype=np.float64, format="csr")
+    if n < 3:
+        # eigsh needs k < n; fall back to a dense solve for toy graphs
+        return float(np.linalg.eigvalsh(A.toarray()).max())
+    return float(eigsh(A, k=1, which="LA", return_eigenvectors=False)[0])
+
+
+def epidemic_threshold(G, disease_model, radius=None):
+    """
+    Estimates whether the disease parameters are above the epidemic threshold.
+
+    Args:
+        G (nx.Graph): The contact network.
+        disease_model (DiseaseModel): Supplies infection/recovery probabilities.
+        radius (float): Precomputed spectral radius, if already known.
+
+    Returns:
+        dict: {"spectral_radius", "critical_ratio", "ratio", "R0", "above_threshold"}
+              where ratio = tau / gamma must exceed critical_ratio = 1 / lambda_max.
+    """
+    if radius is None:
+        radius = spectral_radius(G)
+
+    tau = _to_rate(disease_model.infection_prob)
+    gamma = _to_rate(disease_model.recovery_prob)
+    # No transmission means no epidemic, whatever the recovery rate
+    if tau == 0:
+        ratio = 0.0
+    else:
+        ratio = tau / gamma if gamma > 0 else math.inf
+    critical = 1.0 / radius if radius > 0 else math.inf
+
+    # Degree-based R0: transmissibility times mean excess degree
+    stats = degree_statistics(G)
+    transmissibility = tau / (tau + gamma) if (tau + gamma) > 0 else 0.0
+    excess = (stats["second_moment"] - stats["mean"]) / stats["mean"] if stats["mean"] > 0 else 0.0
+
+    return {
+        "spectral_radius": radius,
+        "critical_ratio": critical,
+        "ratio": ratio,
+        "R0": transmissibility * excess,
+        "above_threshold": ratio > critical,
+    }
+
+
+def _degree_based_rhs(ks, weights, tau, gamma):
+    """Heterogeneous mean-field SIR: one (s_k, i_k) pair per degree class."""
+    mean_k = float((ks * weights).sum())
+    # An isolated node has no edge to pass infection on; without the clip its
+    # (k - 1) = -1 weight would make seeded k=0 cases suppress Theta
+    excess = np.clip(ks - 1, 0, None) * weights / mean_k if mean_k > 0 else np.zeros_like(weights)
+    n_classes = ks.size
+
+    def rhs(t, y):
+        s, i = y[:n_classes], y[n_classes:]
+        theta = float((excess * i).sum())
+        new_inf = tau * ks * s * theta
+        return np.concatenate([-new_inf, new_inf - gamma * i])
+
+    return rhs
+
+
+def _pair_rhs(n, tau, gamma):
+    """Homogeneous pair approximation (Keeling 1999) with the triple closure."""
+    # Mean degree below 1 would make the closure factor, and the triples, negative
+    kappa = max(n - 1.0, 0.0) / n if n > 0 else 0.0
+
+    def rhs(t, y):
+        S, I, SS, SI, II = y
+        S_safe = max(S, 1e-12)
+        SSI = kappa * SS * SI / S_safe
+        ISI = kappa * SI * SI / S_safe
+        return [
+            -tau * SI,
+            tau * SI - gamma * I,
+            -2.0 * tau * SSI,
+            tau * (SSI - ISI - SI) - gamma * SI,
+            2.0 * tau * (ISI + SI) - 2.0 * gamma * II,
+        ]
+
+    return rhs
+
+
+def mean_field_curve(G, disease_model, initial_infected=5, steps=100, method="degree"):
+    """
+    Integrates an analytic approximation of the SIR dynamics on G.
+
+    This is an instant preview of the expected epidemic curve; it does not
+    replace a stochastic DiseaseSimulator run.
+
+    Args:
+        G (nx.Graph): The contact network.
+        disease_model (DiseaseModel): Supplies infection/recovery probabilities.
+        initial_infected (int): Number of seeded cases at time 0.
+        steps (int): Number of days to integrate.
+        method (str): "degree" (heterogeneous mean-field) or "pair"
+                      (pair approximation).
+
+    Returns:
+        list: Expected {"time", "S", "I", "R"} dicts, same shape as
+              DiseaseSimulator.stats_history.
+    """
+    N = G.number_of_nodes()
+    if N == 0:
+        return []
+
+    tau = _to_rate(disease_model.infection_prob)
+    gamma = _to_rate(disease_model.recovery_prob)
+    i0 = min(initial_infected, N) / N
+    t_eval = np.arange(steps + 1, dtype=np.float64)
+    stats = degree_statistics(G)
+
+    if method == "pair":
+        n = stats["mean"]
+        S0, I0 = N * (1.0 - i0), N * i0
+        # Random seeding: pair counts proportional to the product of singles
+        y0 = [S0, I0, n * S0 * S0 / N, n * S0 * I0 / N, n * I0 * I0 / N]
+        sol = solve_ivp(_pair_rhs(n, tau, gamma), (0, steps), y0, t_eval=t_eval, method="LSODA")
+        S, I = sol.y[0], sol.y[1]
+    else:
+        ks = stats["degrees"].astype(np.float64)
+        counts = stats["counts"].astype(np.float64)
+        weights = counts / N
+        y0 = np.concatenate([np.full(ks.size, 1.0 - i0), np.full(ks.size, i0)])
+        sol = solve_ivp(_degree_based_rhs(ks, weights, tau, gamma), (0, steps), y0,
+                        t_eval=t_eval, method="LSODA")
+        S = counts @ sol.y[:ks.size]
+        I = counts @ sol.y[ks.size:]
+
+    # S can only fall in SIR; drop the solver's tiny upward jitter near I = 0
+    S = np.minimum.accumulate(np.clip(S, 0.0, N))
+    I = np.clip(I, 0.0, N)
+    R = np.clip(N - S - I, 0.0, N)
+
+    return [
+        {"time": int(t), "S": float(s), "I": float(i), "R": float(r)}
+        for t, s, i, r in zip(sol.t, S, I, R)
+    ]
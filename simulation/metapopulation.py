@@ -0,0 +1,202 @@
+import numpy as np
+
+from .network_generator import DISTRICT_BOUNDS, HOME_WEIGHTS, COMMUTE_WEIGHTS
+from .rng import CounterRNG, INFECTION, RECOVERY, SEEDING
+
+# Fixed district order used for every compartment array
+DISTRICTS = list(DISTRICT_BOUNDS)
+
+
+def commute_matrix():
+    """
+    Builds the daytime mobility matrix from the city commute weights.
+
+    Returns:
+        np.ndarray: M[h, d] = fraction of residents of district h who spend
+                    the day in district d. Each row sums to 1.
+    """
+    index = {name: i for i, name in enumerate(DISTRICTS)}
+    M = np.zeros((len(DISTRICTS), len(DISTRICTS)))
+    for h in range(len(DISTRICTS)):
+        for dest, weight in COMMUTE_WEIGHTS.items():
+            d = h if dest == "home" else index[dest]
+            M[h, d] += weight
+    return M / M.sum(axis=1, keepdims=True)
+
+
+def district_populations(total):
+    """Splits a city population across home districts using HOME_WEIGHTS."""
+    weights = np.array([HOME_WEIGHTS.get(name, 0.0) for name in DISTRICTS])
+    counts = np.floor(total * weights / weights.sum()).astype(np.int64)
+    # Hand the rounding remainder to the largest residential district
+    counts[np.argmax(weights)] += total - counts.sum()
+    return counts
+
+
+class MetapopulationSimulator:
+    """
+    District-level SIR dynamics for city-scale populations.
+
+    People are aggregated into one S/I/R compartment per home district and
+    mix at home (night) and at their commute destination (day). All updates
+    are array operations over (replicate, district), so the cost does not
+    depend on the population size.
+    """
+
+    def __init__(self, population, disease_model, contact_rate=10.0, day_fraction=0.5,
+                 stochastic=True, replicates=1, seed=None):
+        """
+        Initializes the metapopulation.
+
+        Args:
+            population (int or array): Total city population, or residents
+                                       per district in DISTRICTS order.
+            disease_model (DiseaseModel): Per-contact infection and per-day
+                                          recovery probabilities.
+            contact_rate (float): Mean contacts per person per day.
+            day_fraction (float): Share of contacts made at the commute
+                                  destination rather than at home.
+            stochastic (bool): Binomial draws if True, expected values if False.
+            replicates (int): Independent runs advanced together.
+            seed (int): Root seed of the random streams (see rng.CounterRNG).
+        """
+        if np.ndim(population) == 0:
+            population = district_populations(int(population))
+        self.N = np.asarray(population, dtype=np.float64)
+        self.model = disease_model
+        self.contact_rate = contact_rate
+        self.day_fraction = day_fraction
+        self.stochastic = stochastic
+        self.rng = CounterRNG(seed)
+        self.mobility = commute_matrix()
+        self.time = 0
+
+        shape = (replicates, len(DISTRICTS))
+        self.S = np.broadcast_to(self.N, shape).copy()
+        self.I = np.zeros(shape)
+        self.R = np.zeros(shape)
+
+        # Optional individual-level network living inside one district
+        self.focus = None
+        self.focus_index = None
+
+        # Stats for the Graph (Counts) - mean over replicates, same shape as DiseaseSimulator
+        self.stats_history = []
+        # Per-district compartments at every step: list of (3, replicates, districts)
+        self.district_history = []
+
+        self._record_stats()
+
+    def couple_focus(self, simulator, district="downtown"):
+        """
+        Attaches an individual-level DiseaseSimulator as residents of one district.
+
+        Its infected nodes add to that district's infection pressure, and its
+        susceptible nodes feel the district's force of infection each step.
+        """
+        if self.S.shape[0] != 1:
+            raise ValueError("Hybrid coupling requires replicates=1")
+        self.focus = simulator
+        self.focus_index = DISTRICTS.index(district)
+        self.stats_history[-1] = self._aggregate_stats()
+
+    def infect_initial(self, count=5, district=None):
+        """
+        Seeds infections, either in one district or spread by population.
+        """
+        if district is not None:
+            seeds = np.zeros(len(DISTRICTS))
+            seeds[DISTRICTS.index(district)] = count
+        else:
+            shares = self.N / self.N.sum()
+            seeds = self._per_replicate(SEEDING, lambda gen, r: gen.multinomial(count, shares))
+            seeds = seeds.astype(np.float64)
+        seeds = np.minimum(seeds, self.S)
+        self.S -= seeds
+        self.I += seeds
+        self.stats_history[-1] = self._aggregate_stats()
+        self.district_history[-1] = np.stack([self.S, self.I, self.R])
+
+    def force_of_infection(self):
+        """
+        Returns the per-resident infection probability for this step,
+        shape (replicates, districts).
+        """
+        I, N = self.I, np.broadcast_to(self.N, self.I.shape).copy()
+        if self.focus is not None:
+            I = I.copy()
+            I[:, self.focus_index] += len(self.focus.infected_set)
+            N[:, self.focus_index] += self.focus.graph.number_of_nodes()
+
+        M = self.mobility
+        with np.errstate(divide="ignore", invalid="ignore"):
+            home_prev = np.where(N > 0, I / N, 0.0)
+            day_I = I @ M
+            day_N = N @ M
+            day_prev = np.where(day_N > 0, day_I / day_N, 0.0)
+
+        # Infectious contacts per resident, split between home and work
+        exposure = self.contact_rate * (
+            (1.0 - self.day_fraction) * home_prev + self.day_fraction * (day_prev @ M.T)
+        )
+        return 1.0 - (1.0 - self.model.infection_prob) ** exposure
+
+    def step(self):
+        p_inf = self.force_of_infection()
+
+        if self.stochastic:
+            S, I = self.S.astype(np.int64), self.I.astype(np.int64)
+            new_inf = self._per_replicate(INFECTION, lambda gen, r: gen.binomial(S[r], p_inf[r]))
+            new_rec = self._per_replicate(RECOVERY, lambda gen, r: gen.binomial(I[r], self.model.recovery_prob))
+        else:
+            new_inf = self.S * p_inf
+            new_rec = self.I * self.model.recovery_prob
+
+        if self.focus is not None:
+            self.focus.step(external_prob=float(p_inf[0, self.focus_index]))
+
+        self.S = self.S - new_inf
+        self.I = self.I + new_inf - new_rec
+        self.R = self.R + new_rec
+
+        self.time += 1
+        self._record_stats()
+
+    def _per_replicate(self, stream, draw):
+        """
+        Stacks draw(generator, r) over replicates, each row from its own
+        (replicate, step, stream) address so no row depends on another.
+        """
+        return np.stack([
+            draw(self.rng.generator(r, self.time, stream), r)
+            for r in range(self.S.shape[0])
+        ])
+
+    def _aggregate_stats(self):
+        stats = {
+            "time": self.time,
+            "S": float(self.S.sum(axis=1).mean()),
+            "I": float(self.I.sum(axis=1).mean()),
+            "R": float(self.R.sum(axis=1).mean())
+        }
+        if self.focus is not None:
+            stats["S"] += len(self.focus.susceptible_set)
+            stats["I"] += len(self.focus.infected_set)
+            stats["R"] += len(self.focus.recovered_set)
+        return stats
+
+    def _record_stats(self):
+        self.stats_history.append(self._aggregate_stats())
+        self.district_history.append(np.stack([self.S, self.I, self.R]))
+
+    def run(self, max_steps=100):
+        """
+        Runs the full simulation loop at once.
+        """
+        while self.time < max_steps:
+            active = self.I.sum() > 0
+            if self.focus is not None:
+                active = active or bool(self.focus.infected_set)
+            if not active:
+                break
+            self.step()
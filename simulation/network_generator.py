@@ -2,20 +2,40 @@ import networkx as nx
 import random
 import math
 
-def generate_network(n=2000, model="watts", **kwargs):
+# City Districts (X range, Y range)
+DISTRICT_BOUNDS = {
+    # 1. Suburbs (Residential) - Spread out
+    "suburbs": (0, 40, 0, 100),
+    # 2. Downtown (Commercial) - Dense center
+    "downtown": (45, 65, 45, 65),
+    # 3. Industrial Zone - Bottom Right
+    "industrial": (70, 90, 10, 30),
+    # 4. University/Tech Park - Top Right
+    "uni": (70, 90, 70, 90),
+}
+
+# Where people live: 80% in suburbs, 20% in city apartments
+HOME_WEIGHTS = {"suburbs": 0.8, "downtown": 0.2}
+
+# Where people spend the day; 'home' means work from home / unemployed
+COMMUTE_WEIGHTS = {"downtown": 0.4, "industrial": 0.25, "uni": 0.15, "home": 0.2}
+
+def generate_network(n=2000, model="watts", seed=None, **kwargs):
     """
     Generates the social graph structure.
+
+    The same seed and parameters always produce the same graph.
     """
     if model == "erdos_renyi":
         p = kwargs.get("p", 0.01)
-        G = nx.erdos_renyi_graph(n, p)
+        G = nx.erdos_renyi_graph(n, p, seed=seed)
     elif model == "watts_strogatz":
         k = kwargs.get("k", 10)
         p = kwargs.get("p", 0.05)
-        G = nx.watts_strogatz_graph(n, k, p)
+        G = nx.watts_strogatz_graph(n, k, p, seed=seed)
     else:  # barabasi_albert
         m = kwargs.get("m", 5)
-        G = nx.barabasi_albert_graph(n, m)
+        G = nx.barabasi_albert_graph(n, m, seed=seed)
     
     # Initialize state
     for node in G.nodes():
@@ -35,20 +55,15 @@ def assign_city_locations(G):
     home_coords = {}
     work_coords = {}
     
-    # Define City Districts (X range, Y range)
-    # 1. Suburbs (Residential) - Spread out
-    suburb_bounds = (0, 40, 0, 100) 
-    # 2. Downtown (Commercial) - Dense center
-    downtown_bounds = (45, 65, 45, 65)
-    # 3. Industrial Zone - Bottom Right
-    industrial_bounds = (70, 90, 10, 30)
-    # 4. University/Tech Park - Top Right
-    uni_bounds = (70, 90, 70, 90)
+    suburb_bounds = DISTRICT_BOUNDS["suburbs"]
+    downtown_bounds = DISTRICT_BOUNDS["downtown"]
+    industrial_bounds = DISTRICT_BOUNDS["industrial"]
+    uni_bounds = DISTRICT_BOUNDS["uni"]
 
     for node in G.nodes():
         # --- ASSIGN HOME (mostly Suburbs) ---
         # 80% live in suburbs, 20% in city apartments
-        if random.random() < 0.8:
+        if random.random() < HOME_WEIGHTS["suburbs"]:
             hx = random.uniform(suburb_bounds[0], suburb_bounds[1])
             hy = random.uniform(suburb_bounds[2], suburb_bounds[3])
         else:
@@ -60,8 +75,8 @@ def assign_city_locations(G):
         
         # --- ASSIGN WORK (Commute) ---
         # People commute to Downtown, Industrial, or Uni
-        dest = random.choices(['downtown', 'industrial', 'uni', 'home'], 
-                              weights=[0.4, 0.25, 0.15, 0.2])[0]
+        dest = random.choices(list(COMMUTE_WEIGHTS), 
+                              weights=list(COMMUTE_WEIGHTS.values()))[0]
         
         if dest == 'downtown':
             wx = random.uniform(downtown_bounds[0], downtown_bounds[1])
@@ -0,0 +1,62 @@
+import numpy as np
+
+# Independent stream ids, one per kind of random decision
+INFECTION, RECOVERY, SEEDING, EXTERNAL, ATTRIBUTION = range(5)
+
+
+class CounterRNG:
+    """
+    Counter-based random streams addressed by (replicate, step, stream, node).
+
+    Every (replicate, step, stream) triple selects its own Philox counter,
+    and node i reads the i-th draw of that stream. A draw therefore depends
+    only on its address, never on how many draws happened before it, so
+    serial, batched and sharded engines that read the same addresses make
+    bit-identical decisions.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed (int or np.random.SeedSequence): Root seed. None draws fresh
+                entropy; the value actually used is kept in self.seed so the
+                run can be reproduced.
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            seed_seq = self.seed = seed
+        else:
+            seed_seq = np.random.SeedSequence(seed)
+            self.seed = seed_seq.entropy
+        self.key = seed_seq.generate_state(2, np.uint64)
+
+    def generator(self, replicate, step, stream, offset=0):
+        """
+        Returns a Generator positioned at draw `offset` of one stream.
+
+        Philox advances in blocks of four 64-bit outputs, so the offset is
+        reached by jumping whole blocks and discarding the remainder.
+        """
+        bit_gen = np.random.Philox(key=self.key, counter=[0, step, replicate, stream])
+        bit_gen.advance(offset // 4)
+        gen = np.random.Generator(bit_gen)
+        if offset % 4:
+            gen.random(offset % 4)
+        return gen
+
+    def uniforms(self, replicate, step, stream, n, offset=0):
+        """Uniform [0, 1) draws for nodes offset .. offset + n - 1."""
+        return self.generator(replicate, step, stream, offset).random(n)
+
+
+def pick_seeds(keys, candidates, count):
+    """
+    Chooses `count` candidates with the smallest keys (ties broken by index).
+
+    Args:
+        keys (np.ndarray): One SEEDING uniform per node.
+        candidates (np.ndarray): Node indices eligible for seeding.
+        count (int): Number of seeds.
+    """
+    candidates = np.sort(np.asarray(candidates, dtype=np.int64))
+    order = np.argsort(keys[candidates], kind="stable")
+    return candidates[order[:count]]
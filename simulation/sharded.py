@@ -0,0 +1,242 @@
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy.sparse import csr_array
+
+from .batched import graph_to_csr, SUSCEPTIBLE, INFECTED, RECOVERED
+from .disease_model import infection_table
+from .rng import CounterRNG, pick_seeds, INFECTION, RECOVERY, SEEDING
+
+
+def _attach(name, shape, dtype):
+    """Maps an existing shared memory block as a numpy array."""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _partition(indptr, n_shards):
+    """
+    Splits node ids into contiguous ranges holding roughly equal edge counts.
+
+    Returns:
+        np.ndarray: Shard boundaries, length n_shards + 1.
+    """
+    n = indptr.size - 1
+    targets = np.linspace(0, indptr[-1], n_shards + 1)
+    bounds = np.searchsorted(indptr, targets, side="left")
+    bounds[0], bounds[-1] = 0, n
+    return np.maximum.accumulate(np.minimum(bounds, n))
+
+
+def _local_adjacency(indptr, indices, start, end):
+    """
+    Builds the shard's CSR with columns relabelled to [own nodes | halo nodes].
+
+    Returns:
+        A (csr_array): (own, own + halo) adjacency.
+        halo (np.ndarray): Global ids of neighbours owned by other shards.
+    """
+    lo, hi = indptr[start], indptr[end]
+    cols = indices[lo:hi].astype(np.int64)
+    outside = (cols < start) | (cols >= end)
+    halo = np.unique(cols[outside])
+
+    n_own = end - start
+    local = cols - start
+    local[outside] = n_own + np.searchsorted(halo, cols[outside])
+    data = np.ones(cols.size, dtype=np.float32)
+    A = csr_array((data, local, indptr[start:end + 1] - lo), shape=(n_own, n_own + halo.size))
+    return A, halo
+
+
+def _shard_worker(conn, spec):
+    """
+    Worker loop: owns nodes [start, end) and updates them once per command.
+
+    The current step reads from state buffer (t % 2) and writes buffer
+    ((t + 1) % 2), so shards never see each other's half-written updates.
+    Only the halo (boundary neighbours from other shards) is gathered from
+    the shared state each step.
+    """
+    n, start, end = spec["n"], spec["start"], spec["end"]
+    handles = []
+    shm, indptr = _attach(spec["indptr"], (n + 1,), np.int64)
+    handles.append(shm)
+    shm, indices = _attach(spec["indices"], (spec["nnz"],), np.int32)
+    handles.append(shm)
+    shm, buffers = _attach(spec["state"], (2, n), np.int8)
+    handles.append(shm)
+
+    A, halo = _local_adjacency(indptr, indices, start, end)
+    table = infection_table(spec["beta"], spec["max_degree"])
+    gamma = spec["gamma"]
+    rng, replicate = CounterRNG(spec["seed"]), spec["replicate"]
+
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        t = msg
+        current, nxt = buffers[t % 2], buffers[(t + 1) % 2]
+
+        own = current[start:end]
+        infected = np.concatenate([own == INFECTED, current[halo] == INFECTED])
+        pressure = (A @ infected.astype(np.float32)).astype(np.int64)
+        p_inf = table[pressure]
+
+        # Read this shard's slice of the global per-node streams
+        u_inf = rng.uniforms(replicate, t, INFECTION, own.size, offset=start)
+        u_rec = rng.uniforms(replicate, t, RECOVERY, own.size, offset=start)
+
+        new_state = own.copy()
+        new_state[(own == SUSCEPTIBLE) & (u_inf < p_inf)] = INFECTED
+        new_state[(own == INFECTED) & (u_rec < gamma)] = RECOVERED
+        nxt[start:end] = new_state
+
+        conn.send(np.bincount(new_state, minlength=3)[:3])
+
+    del indptr, indices, buffers
+    for shm in handles:
+        shm.close()
+    conn.close()
+
+
+class ShardedSimulator:
+    """
+    Single-graph SIR simulation split across worker processes.
+
+    Nodes are partitioned into contiguous shards; the CSR adjacency and a
+    double-buffered state vector live in multiprocessing.shared_memory.
+    Each worker updates only its shard and reads only its halo, using the
+    same per-node rule and the same (replicate, step, node) random streams
+    as DiseaseSimulator, so a run is bit-identical to the serial run with
+    the same seed, whatever the number of workers.
+
+    Use as a context manager (or call close()) to release the workers and
+    shared memory.
+    """
+
+    def __init__(self, graph, disease_model, n_workers=None, seed=None, replicate=0):
+        """
+        Args:
+            graph (nx.Graph): The contact network.
+            disease_model (DiseaseModel): Transmission and recovery rules.
+            n_workers (int): Worker processes (default: all cores).
+            seed (int): Root seed of the random streams (see rng.CounterRNG).
+            replicate (int): Replicate id under the same seed.
+        """
+        self.nodes, A = graph_to_csr(graph)
+        self.model = disease_model
+        self.n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(self.nodes) or 1))
+        self.rng = CounterRNG(seed)
+        self.replicate = replicate
+        self.time = 0
+
+        n = len(self.nodes)
+        self._shm = []
+        self.indptr = self._share(A.indptr.astype(np.int64))
+        self.indices = self._share(A.indices.astype(np.int32))
+        self.buffers = self._share(np.full((2, n), SUSCEPTIBLE, dtype=np.int8))
+
+        # Stats for the Graph (Counts) - Used for Charts
+        self.stats_history = []
+
+        self.bounds = _partition(self.indptr, self.n_workers)
+        self._start_workers()
+        self._record_stats(np.array([n, 0, 0]))
+
+    def _share(self, array):
+        """Copies an array into a new shared memory block."""
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared[...] = array
+        self._shm.append(shm)
+        return shared
+
+    def _start_workers(self):
+        ctx = mp.get_context()
+        self._conns, self._procs = [], []
+        max_degree = int(np.diff(self.indptr).max(initial=0))
+        for w in range(self.n_workers):
+            spec = {
+                "n": len(self.nodes),
+                "nnz": int(self.indices.size),
+                "start": int(self.bounds[w]),
+                "end": int(self.bounds[w + 1]),
+                "indptr": self._shm[0].name,
+                "indices": self._shm[1].name,
+                "state": self._shm[2].name,
+                "beta": self.model.infection_prob,
+                "gamma": self.model.recovery_prob,
+                "max_degree": max_degree,
+                "seed": self.rng.seed,
+                "replicate": self.replicate,
+            }
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_worker, args=(child, spec), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    @property
+    def state(self):
+        """Current integer state of every node (see batched.STATE_CODES)."""
+        return self.buffers[self.time % 2]
+
+    def infect_initial(self, count=5):
+        state = self.state
+        keys = self.rng.uniforms(self.replicate, self.time, SEEDING, state.size)
+        state[pick_seeds(keys, np.flatnonzero(state == SUSCEPTIBLE), count)] = INFECTED
+        self.stats_history[-1] = self._counts_to_stats(np.bincount(state, minlength=3)[:3])
+
+    def step(self):
+        for conn in self._conns:
+            conn.send(self.time)
+        counts = sum(conn.recv() for conn in self._conns)
+        self.time += 1
+        self._record_stats(counts)
+
+    def _counts_to_stats(self, counts):
+        return {"time": self.time, "S": int(counts[0]), "I": int(counts[1]), "R": int(counts[2])}
+
+    def _record_stats(self, counts):
+        self.stats_history.append(self._counts_to_stats(counts))
+
+    def run(self, max_steps=100):
+        """
+        Runs the full simulation loop at once.
+        """
+        while self.time < max_steps:
+            if not self.stats_history[-1]["I"]:
+                break
+            self.step()
+
+    def close(self):
+        """Stops the workers and frees the shared memory."""
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+
+        # Drop our views before releasing the buffers they point into
+        self.indptr = self.indices = None
+        self.buffers = self.buffers.copy()
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
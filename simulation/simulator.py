@@ -1,14 +1,37 @@
-import random
+import numpy as np
+
+from .rng import CounterRNG, pick_seeds, INFECTION, RECOVERY, SEEDING, EXTERNAL, ATTRIBUTION
+from .transmission import TransmissionTree, NO_INFECTOR
 
 class DiseaseSimulator:
     """
     running disease simulations.
     """
     
-    def __init__(self, graph, disease_model):
+    def __init__(self, graph, disease_model, record_transmission=False, seed=None, replicate=0):
+        """
+        Args:
+            graph (nx.Graph): The contact network.
+            disease_model (DiseaseModel): Transmission and recovery rules.
+            record_transmission (bool): Keep a TransmissionTree of who
+                                        infected whom (see self.transmission).
+            seed (int): Root seed of the random streams (see rng.CounterRNG).
+                        None picks one; it is kept in self.rng.seed.
+            replicate (int): Replicate id, selecting an independent stream
+                             under the same seed.
+        """
         self.graph = graph
         self.model = disease_model
         self.time = 0
+
+        # Draws are addressed by (replicate, step, node position), so results
+        # match BatchedSimulator / ShardedSimulator runs with the same seed
+        self.rng = CounterRNG(seed)
+        self.replicate = replicate
+        self.nodes = list(self.graph.nodes())
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        # Generated graphs label nodes 0..n-1, so a node is its own position
+        self._identity_index = all(node == i and type(node) is int for i, node in enumerate(self.nodes))
         
         # State Sets for O(1) ops
         self.susceptible_set = set()
@@ -21,6 +44,11 @@ class DiseaseSimulator:
         #  - Used for 3D Replay
         # Stores a list of dictionaries: [{node_id: 'S', ...}, {node_id: 'I', ...}]
         self.node_history = []
+
+        # Optional who-infected-whom record, indexed by node position
+        self.transmission = None
+        if record_transmission:
+            self.transmission = TransmissionTree(self.nodes)
         
         self._initialize_node_states()
 
@@ -36,11 +64,21 @@ class DiseaseSimulator:
         if count > len(self.susceptible_set):
             count = len(self.susceptible_set)
             
-        patient_zero_nodes = random.sample(list(self.susceptible_set), count)
+        keys = self._uniforms(SEEDING)
+        candidates = [self.node_index[node] for node in self.susceptible_set]
+        patient_zero_nodes = [self.nodes[i] for i in pick_seeds(keys, candidates, count)]
 
         for node in patient_zero_nodes:
             self._set_node_state(node, "I")
 
+        if self.transmission is not None:
+            self._record_transmission({node: None for node in patient_zero_nodes})
+
+        # The current day's record now means "after seeding", as in every engine
+        self.stats_history.pop()
+        self.node_history.pop()
+        self._record_stats()
+
     def _set_node_state(self, node, new_state):
         self.susceptible_set.discard(node)
         self.infected_set.discard(node)
@@ -55,19 +93,52 @@ class DiseaseSimulator:
         
         self.graph.nodes[node]["state"] = new_state
 
-    def step(self):
-        newly_infected = set()
-        newly_recovered = set()
+    def step(self, external_prob=0.0):
+        """
+        Advances the simulation by one day.
+
+        Args:
+            external_prob (float): Per-node probability of infection from
+                                   outside the graph (e.g. a coupled
+                                   metapopulation). 0 disables it.
+        """
+        index = self.node_index
+        # newly infected node -> infector (None for outside infections)
+        newly_infected = {}
 
-        # Infection Logic (Optimized)
+        # Infection Logic (Optimized): infected-neighbour count per exposed node
+        exposed = {}
         for node in self.infected_set:
             for neighbor in self.graph.neighbors(node):
                 if neighbor in self.susceptible_set:
-                    if self.model.should_infect():
-                        newly_infected.add(neighbor)
-            
-            if self.model.should_recover():
-                newly_recovered.add(node)
+                    exposed[neighbor] = exposed.get(neighbor, 0) + 1
+
+        # One draw per exposed node against p(m) = 1 - (1 - beta)^m
+        if exposed:
+            targets = list(exposed)
+            positions = self._positions(targets)
+            contacts = np.fromiter(exposed.values(), dtype=np.int64, count=len(targets))
+            table = self.model.infection_table(contacts.max())
+            hit = self._uniforms(INFECTION)[positions] < table[contacts]
+
+            hits = np.flatnonzero(hit).tolist()
+            if self.transmission is None:
+                newly_infected = dict.fromkeys(targets[k] for k in hits)
+            else:
+                who = self._uniforms(ATTRIBUTION)[positions[hits]].tolist()
+                for k, u in zip(hits, who):
+                    # Credit one infected neighbour, chosen by its own draw
+                    sources = sorted((nb for nb in self.graph.neighbors(targets[k])
+                                      if nb in self.infected_set), key=index.__getitem__)
+                    newly_infected[targets[k]] = sources[int(u * len(sources))]
+
+        # Infection pressure from outside the network
+        if external_prob > 0:
+            outside = [n for n in self._select(self.susceptible_set, EXTERNAL, external_prob)
+                       if n not in newly_infected]
+            newly_infected.update(dict.fromkeys(outside))
+
+        newly_recovered = self._select(self.infected_set, RECOVERY, self.model.recovery_prob)
 
         # Apply Changes
         for node in newly_infected:
@@ -77,8 +148,35 @@ class DiseaseSimulator:
             self._set_node_state(node, "R")
 
         self.time += 1
+        if self.transmission is not None:
+            self._record_transmission(newly_infected)
         self._record_stats()
 
+    def _uniforms(self, stream):
+        """One uniform draw per node for the current step."""
+        return self.rng.uniforms(self.replicate, self.time, stream, len(self.nodes))
+
+    def _positions(self, nodes):
+        """Array of node positions (indices into self.nodes) for a node list."""
+        if self._identity_index:
+            return np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+        index = self.node_index
+        return np.fromiter((index[n] for n in nodes), dtype=np.int64, count=len(nodes))
+
+    def _select(self, nodes, stream, prob):
+        """Nodes whose draw on `stream` this step falls below prob."""
+        nodes = list(nodes)
+        positions = self._positions(nodes)
+        chosen = np.flatnonzero(self._uniforms(stream)[positions] < prob)
+        return [nodes[k] for k in chosen.tolist()]
+
+    def _record_transmission(self, infections):
+        """Writes {infectee: infector} for the current day into the tree."""
+        index = self.node_index
+        targets = [index[node] for node in infections]
+        sources = [NO_INFECTOR if src is None else index[src] for src in infections.values()]
+        self.transmission.record(targets, sources, self.time)
+
     def _record_stats(self):
         # 1. Record aggregate counts (for Charts)
         stats = {
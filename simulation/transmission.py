@@ -0,0 +1,113 @@
+import numpy as np
+
+# Infector id for seeded cases and infections from outside the graph
+NO_INFECTOR = -1
+
+
+class TransmissionTree:
+    """
+    Who-infected-whom record for a single simulation run.
+
+    Stored as two preallocated int32 arrays indexed by node position, so
+    recording costs one array write per infection and every analytic below
+    is a vectorized pass over the arrays.
+    """
+
+    def __init__(self, nodes):
+        """
+        Args:
+            nodes (list): Node ids in index order; position i in the arrays
+                          refers to nodes[i].
+        """
+        self.nodes = list(nodes)
+        n = len(self.nodes)
+        self.infector = np.full(n, NO_INFECTOR, dtype=np.int32)
+        self.infection_day = np.full(n, -1, dtype=np.int32)
+
+    def record(self, targets, sources, day):
+        """
+        Stores a batch of infections that happened on the same day.
+
+        Args:
+            targets (array): Indices of newly infected nodes.
+            sources (array): Indices of their infectors (NO_INFECTOR if none).
+            day (int): Simulation day of the infections.
+        """
+        targets = np.asarray(targets, dtype=np.int32)
+        self.infector[targets] = np.asarray(sources, dtype=np.int32)
+        self.infection_day[targets] = day
+
+    def infected_mask(self):
+        """Boolean mask of nodes that were ever infected."""
+        return self.infection_day >= 0
+
+    def offspring_counts(self):
+        """Number of secondary cases caused by each infected node (index order)."""
+        src = self.infector[self.infector >= 0]
+        counts = np.bincount(src, minlength=len(self.nodes))
+        return counts[self.infected_mask()]
+
+    def offspring_distribution(self):
+        """
+        Returns:
+            np.ndarray: dist[k] = number of cases that infected exactly k others.
+        """
+        return np.bincount(self.offspring_counts())
+
+    def reproduction_number(self):
+        """
+        Case reproduction number R_t: mean offspring of cases infected on day t.
+
+        Cases infected near the end of a truncated run have not finished
+        transmitting, so the tail is biased low.
+
+        Returns:
+            np.ndarray: R_t per day (NaN on days with no new cases).
+        """
+        mask = self.infected_mask()
+        days = self.infection_day[mask]
+        if days.size == 0:
+            return np.array([])
+        cases = np.bincount(days)
+        offspring = np.bincount(days, weights=self.offspring_counts())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(cases > 0, offspring / cases, np.nan)
+
+    def generation_intervals(self):
+        """Days between infector and infectee for every traced transmission."""
+        mask = self.infector >= 0
+        return self.infection_day[mask] - self.infection_day[self.infector[mask]]
+
+    def chain_depth(self):
+        """
+        Generation number of every node: 0 for roots, -1 if never infected.
+
+        Infectors are always infected on an earlier day, so processing one day
+        at a time resolves every chain with a single gather per day.
+        """
+        depth = np.full(len(self.nodes), -1, dtype=np.int32)
+        mask = self.infected_mask()
+        order = np.flatnonzero(mask)
+        order = order[np.argsort(self.infection_day[order], kind="stable")]
+        days = self.infection_day[order]
+        bounds = np.flatnonzero(np.diff(days)) + 1
+
+        for batch in np.split(order, bounds):
+            src = self.infector[batch]
+            has_src = src >= 0
+            depth[batch] = np.where(has_src, depth[np.where(has_src, src, 0)] + 1, 0)
+        return depth
+
+    def superspreader_share(self, top_fraction=0.2):
+        """
+        Share of all traced transmissions caused by the most infectious cases.
+
+        Args:
+            top_fraction (float): Fraction of cases counted as superspreaders.
+        """
+        counts = np.sort(self.offspring_counts())[::-1]
+        total = counts.sum()
+        if total == 0:
+            return 0.0
+        top = max(1, int(np.ceil(top_fraction * counts.size)))
+        return float(counts[:top].sum() / total)
@@ -1,59 +1,138 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from .color_map import STATE_COLORS
 
-def plot_epidemic_curve(stats_history):
+# Upper bound on points per trace sent to the browser
+MAX_POINTS = 2000
+
+STATES = ['S', 'I', 'R']
+
+def downsample_minmax(y, max_points=MAX_POINTS):
+    """
+    Picks the indices of a series to keep when plotting it.
+
+    The series is split into equal buckets and the min and max of each
+    bucket are kept (plus the first and last point), so every peak and
+    trough survives exactly while the point count stays bounded.
+
+    Args:
+        y (array): The series values.
+        max_points (int): Maximum number of indices to return.
+
+    Returns:
+        np.ndarray: Sorted indices into y.
     """
-    Generates an interactive Plotly line chart of the 
+    y = np.asarray(y, dtype=np.float64)
+    n = y.size
+    if n <= max_points:
+        return np.arange(n)
+    if max_points < 4:
+        # Too few points for min/max buckets: keep the largest values
+        return np.sort(np.argsort(y, kind="stable")[::-1][:max(max_points, 0)])
+
+    n_buckets = max(1, (max_points - 2) // 2)
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+
+    # Trailing buckets can be all padding when n is not a multiple of size
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    lo = offsets + np.nanargmin(buckets[valid], axis=1)
+    hi = offsets + np.nanargmax(buckets[valid], axis=1)
+
+    return np.unique(np.concatenate([[0, n - 1], lo, hi]))
+
+def _curve_columns(stats_history):
+    """Extracts time and S/I/R columns as arrays without melting to long format."""
+    if isinstance(stats_history, pd.DataFrame):
+        return {col: stats_history[col].to_numpy() for col in ['time'] + STATES}
+    return {
+        col: np.fromiter((row[col] for row in stats_history), dtype=np.float64, count=len(stats_history))
+        for col in ['time'] + STATES
+    }
+
+def plot_epidemic_curve(stats_history, max_points=MAX_POINTS):
+    """
+    Generates an interactive Plotly line chart of the
     Susceptible, Infected, and Recovered populations over time.
 
+    Long runs are min/max downsampled per trace, so the figure size is
+    bounded by max_points regardless of the number of steps.
+
     Args:
-        stats_history (list or DataFrame): The list of stat dicts 
+        stats_history (list or DataFrame): The list of stat dicts
                               from DiseaseSimulator.stats_history or a DataFrame.
+        max_points (int): Maximum points per trace.
 
     Returns:
         plotly.graph_objects.Figure: The interactive line chart.
     """
     # Handle both list and DataFrame inputs
     if isinstance(stats_history, pd.DataFrame):
-        df = stats_history
-    else:
-        if not stats_history:
+        if stats_history.empty:
             return px.line(title="No data to display.")
-        # Convert the stats history list of dicts into a DataFrame
-        df = pd.DataFrame(stats_history)
-    
-    # Check if DataFrame is empty
-    if df.empty:
+    elif not stats_history:
         return px.line(title="No data to display.")
-    
-    # Melt the DataFrame to "long" format, which is what Plotly prefers
-    # 'time' is the id, 'S', 'I', 'R' become 'variable' and 'value'
-    df_long = df.melt(
-        id_vars=['time'], 
-        value_vars=['S', 'I', 'R'], 
-        var_name='State', 
-        value_name='Population'
-    )
 
-    # Create the line chart
-    fig = px.line(
-        df_long,
-        x='time',
-        y='Population',
-        color='State',  # This automatically creates a legend
-        title='Epidemic Curve (S-I-R Model)',
-        color_discrete_map={
-            'S': STATE_COLORS.get('S'),
-            'I': STATE_COLORS.get('I'),
-            'R': STATE_COLORS.get('R')
-        }
-    )
-    
+    fig = go.Figure()
+    _add_state_traces(fig, _curve_columns(stats_history), max_points)
+    return fig
+
+def _add_state_traces(fig, columns, max_points):
+    """Adds one downsampled wide-format trace per state and the curve layout."""
+    # Each trace is downsampled on its own, so each keeps its own peaks exactly
+    for state in STATES:
+        keep = downsample_minmax(columns[state], max_points)
+        fig.add_trace(go.Scatter(
+            x=columns['time'][keep],
+            y=columns[state][keep],
+            mode='lines',
+            name=state,
+            line=dict(color=STATE_COLORS.get(state))
+        ))
+
     fig.update_layout(
+        title='Epidemic Curve (S-I-R Model)',
         xaxis_title="Time Step (Days)",
         yaxis_title="Number of People",
+        legend_title_text='State',
         uirevision='constant'  # Preserve zoom/pan across updates
     )
-    
-    return fig
\ No newline at end of file
+
+def append_epidemic_curve(fig, new_stats, max_points=MAX_POINTS):
+    """
+    Extends a figure from plot_epidemic_curve() with newly simulated steps.
+
+    Only the new rows are converted; a trace is re-downsampled once it
+    grows past max_points, which keeps its existing extremes.
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to update in place.
+        new_stats (list or DataFrame): Stat rows produced since the last call.
+        max_points (int): Maximum points per trace.
+
+    Returns:
+        plotly.graph_objects.Figure: The same figure, for chaining.
+    """
+    if len(new_stats) == 0:
+        return fig
+
+    columns = _curve_columns(new_stats)
+    if not any(trace.name in STATES for trace in fig.data):
+        # Started from an empty/placeholder figure: replace it with S/I/R traces
+        fig.data = []
+        _add_state_traces(fig, columns, max_points)
+        return fig
+
+    for trace in fig.data:
+        if trace.name not in STATES:
+            continue
+        x = np.concatenate([np.asarray(trace.x, dtype=np.float64), columns['time']])
+        y = np.concatenate([np.asarray(trace.y, dtype=np.float64), columns[trace.name]])
+        keep = downsample_minmax(y, max_points)
+        trace.x, trace.y = x[keep], y[keep]
+    return fig
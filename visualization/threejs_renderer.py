@@ -1,6 +1,9 @@
+import base64
 import json
 import uuid
-from typing import Dict, List
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
 import networkx as nx
 
 # Explicit colors for the 3 conditions
@@ -10,19 +13,79 @@ COLORS = {
     'R': '#00ff00'   # Bright Green
 }
 
-def generate_threejs_html(
-    graph: nx.Graph, 
-    history: List[Dict], 
-    pos: Dict, 
-    stats_history: List[Dict], 
-    is_paused: bool = False,
-    height: int = 720
-) -> str:
+# postMessage type used to drive a mounted scene from Streamlit reruns
+CONTROL_MESSAGE = "netsim-control"
+
+CDN_MODULE_HEADER = """
+        import * as THREE from 'https://cdn.skypack.dev/three@0.136.0';
+        import { OrbitControls } from 'https://cdn.skypack.dev/three@0.136.0/examples/jsm/controls/OrbitControls.js';
+"""
+
+# Bundled UMD build (defines the global THREE) used for offline replays
+THREE_JS_PATH = Path(__file__).resolve().parent.parent / ".streamlit" / "static" / "js" / "three.min.js"
+
+# State letters in the order used by the compressed replay history
+REPLAY_STATES = ["S", "I", "R"]
+
+# Minimal stand-in for examples/jsm OrbitControls, which three.min.js lacks.
+# Left-drag orbits, wheel zooms, and it supports the autoRotate/damping flags the scene uses.
+OFFLINE_MODULE_HEADER = """
+        const THREE = window.THREE;
+        class OrbitControls {
+            constructor(camera, dom) {
+                this.camera = camera;
+                this.target = new THREE.Vector3();
+                this.enableDamping = false;
+                this.autoRotate = false;
+                this.autoRotateSpeed = 2.0;
+                this.spherical = new THREE.Spherical().setFromVector3(camera.position);
+                this.vTheta = 0; this.vPhi = 0;
+                let dragging = false, lastX = 0, lastY = 0;
+                dom.addEventListener('pointerdown', (e) => {
+                    if (e.button !== 0) return;
+                    dragging = true; lastX = e.clientX; lastY = e.clientY;
+                });
+                window.addEventListener('pointerup', () => { dragging = false; });
+                window.addEventListener('pointermove', (e) => {
+                    if (!dragging) return;
+                    this.vTheta -= (e.clientX - lastX) * 0.005;
+                    this.vPhi -= (e.clientY - lastY) * 0.005;
+                    lastX = e.clientX; lastY = e.clientY;
+                });
+                dom.addEventListener('wheel', (e) => {
+                    e.preventDefault();
+                    this.spherical.radius = Math.min(3500, Math.max(20, this.spherical.radius * Math.exp(e.deltaY * 0.001)));
+                }, { passive: false });
+            }
+            update() {
+                if (this.autoRotate) this.vTheta -= 2 * Math.PI / 3600 * this.autoRotateSpeed;
+                this.spherical.theta += this.vTheta;
+                this.spherical.phi = Math.min(Math.PI - 1e-3, Math.max(1e-3, this.spherical.phi + this.vPhi));
+                this.spherical.makeSafe();
+                const damping = this.enableDamping ? 0.9 : 0.0;
+                this.vTheta *= damping; this.vPhi *= damping;
+                this.camera.position.setFromSpherical(this.spherical).add(this.target);
+                this.camera.lookAt(this.target);
+            }
+        }
+"""
+
+def build_scene_payload(
+    graph: nx.Graph,
+    history: List[Dict],
+    pos: Dict,
+    stats_history: List[Dict]
+) -> Dict:
     """
-    Generates an Interactive 3D Network with shiny nodes, golden connections, and live stats.
+    Serializes a finished simulation into the JSON blobs the 3D scene consumes.
+
+    This is the expensive part of rendering (node dicts, edge lists, the full
+    history matrix), so callers should build it once per simulation result
+    and pass it back into generate_threejs_html() on every rerun.
+
+    Returns:
+        dict: {"key", "scene_json", "history_json", "stats_json"}
     """
-    
-    # --- 1. PREPARE DATA ---
     nodes_data = []
     nodes_list = list(graph.nodes())
     node_count = len(nodes_list)
@@ -73,20 +136,79 @@ def generate_threejs_html(
     else:
         history_matrix = [['S'] * len(nodes_list)]
 
-    scene_json = json.dumps({
-        "nodes": nodes_data,
-        "edges": edge_pairs,
-        "adjacency": adjacency
-    })
-    history_json = json.dumps(history_matrix)
-    stats_json = json.dumps(stats_history)
-    
-    container_id = f"net-{uuid.uuid4().hex}"
+    return {
+        # Stable id for this result: keeps the emitted HTML byte-identical
+        # across reruns and lets control messages find the right scene.
+        "key": uuid.uuid4().hex,
+        "scene_json": json.dumps({
+            "nodes": nodes_data,
+            "edges": edge_pairs,
+            "adjacency": adjacency
+        }),
+        "history_json": json.dumps(history_matrix),
+        "stats_json": json.dumps(stats_history),
+    }
+
+def generate_control_html(scene_key: str, is_paused: bool) -> str:
+    """
+    Tiny companion component that forwards the play state to an already
+    mounted scene, so toggling pause does not resend the whole scene.
+    """
+    message = json.dumps({"type": CONTROL_MESSAGE, "key": scene_key, "paused": bool(is_paused)})
+    return f"""
+    <script>
+        (function() {{
+            const msg = {message};
+            let host = window;
+            try {{
+                host = window.parent;
+                host.__netsimControl = host.__netsimControl || {{}};
+                host.__netsimControl[msg.key] = msg;
+            }} catch (err) {{}}
+            for (let i = 0; i < host.frames.length; i++) {{
+                host.frames[i].postMessage(msg, "*");
+            }}
+        }})();
+    </script>
+    """
+
+def generate_threejs_html(
+    graph: nx.Graph, 
+    history: List[Dict], 
+    pos: Dict, 
+    stats_history: List[Dict], 
+    is_paused: bool = False,
+    height: int = 720,
+    payload: Optional[Dict] = None
+) -> str:
+    """
+    Generates an Interactive 3D Network with shiny nodes, golden connections, and live stats.
+
+    Pass a payload from build_scene_payload() to skip re-serializing the scene.
+    """
+    if payload is None:
+        payload = build_scene_payload(graph, history, pos, stats_history)
+
+    data_js = f"""
+        const data = {payload["scene_json"]};
+        const history = {payload["history_json"]};
+        const stats = {payload["stats_json"]};
+    """
+    return _scene_html(payload["key"], f"{height}px", is_paused, CDN_MODULE_HEADER, data_js)
+
+def _scene_html(scene_key: str, css_height: str, is_paused: bool, module_header: str, data_js: str) -> str:
+    """
+    Assembles the scene markup and script.
+
+    module_header must provide THREE and OrbitControls; data_js must define
+    the `data`, `history` and `stats` constants.
+    """
+    container_id = f"net-{scene_key}"
     
     start_paused_js = "true" if is_paused else "false"
 
     html = f"""
-    <div id="{container_id}" style="width:100%; height:{height}px; border-radius:12px; overflow:hidden; position:relative; background-color: #0c1625; border: 1px solid #333;">
+    <div id="{container_id}" style="width:100%; height:{css_height}; border-radius:12px; overflow:hidden; position:relative; background-color: #0c1625; border: 1px solid #333;">
         
         <!-- LOADING -->
         <div id="loading-{container_id}" style="position:absolute; top:0; left:0; width:100%; height:100%; display:flex; align-items:center; justify-content:center; background:rgba(0,0,0,0.9); z-index:50; color: #aaa;">
@@ -124,8 +246,7 @@ def generate_threejs_html(
     </div>
 
     <script type="module">
-        import * as THREE from 'https://cdn.skypack.dev/three@0.136.0';
-        import {{ OrbitControls }} from 'https://cdn.skypack.dev/three@0.136.0/examples/jsm/controls/OrbitControls.js';
+        {module_header}
 
         const container = document.getElementById("{container_id}");
         const loading = document.getElementById("loading-{container_id}");
@@ -141,9 +262,7 @@ def generate_threejs_html(
         const elI = document.getElementById("i-{container_id}");
         const elR = document.getElementById("r-{container_id}");
 
-        const data = {scene_json};
-        const history = {history_json};
-        const stats = {stats_json};
+        {data_js}
         
         // --- SCENE ---
         const scene = new THREE.Scene();
@@ -301,6 +420,20 @@ def generate_threejs_html(
             }}
         }});
 
+        function applyControl(msg) {{
+            if (!msg || msg.type !== "{CONTROL_MESSAGE}" || msg.key !== "{scene_key}") return;
+            if (msg.paused === isPaused) return;
+            isPaused = msg.paused;
+            btnPlay.innerText = isPaused ? "▶ PLAY" : "⏸ PAUSE";
+        }}
+
+        // Play state arrives as a small message instead of a fresh scene
+        window.addEventListener('message', (e) => applyControl(e.data));
+        try {{
+            const pending = window.parent.__netsimControl;
+            if (pending) applyControl(pending["{scene_key}"]);
+        }} catch (err) {{}}
+
         btnFs.addEventListener('click', (e) => {{
             e.stopPropagation();
             toggleFullscreen();
@@ -375,4 +508,76 @@ def generate_threejs_html(
         }});
     </script>
     """
+    return html
+
+def _encode_history(nodes_list: List, history: List[Dict]) -> str:
+    """Packs the replay history as deflated uint8 state codes, base64 encoded."""
+    codes = {state: i for i, state in enumerate(REPLAY_STATES)}
+    rows = history or [{}]
+    raw = bytes(codes.get(step_data.get(n, 'S'), 0) for step_data in rows for n in nodes_list)
+    return base64.b64encode(zlib.compress(raw, 9)).decode('ascii')
+
+def export_replay_html(
+    graph: nx.Graph,
+    history: List[Dict],
+    pos: Dict,
+    stats_history: List[Dict],
+    path: Optional[str] = None,
+    payload: Optional[Dict] = None,
+    library_src: Optional[str] = None
+) -> str:
+    """
+    Builds a standalone replay page that needs no server and no network.
+
+    The bundled three.min.js is inlined (or referenced via library_src, e.g. a
+    relative path next to the exported file) and the node history is embedded
+    as a deflate-compressed binary blob decoded in the browser.
+
+    Args:
+        path (str): If given, the page is also written to this file.
+        payload (dict): Reuse a build_scene_payload() result.
+        library_src (str): Script src for Three.js instead of inlining it.
+
+    Returns:
+        str: The replay HTML document.
+    """
+    if payload is None:
+        payload = build_scene_payload(graph, [], pos, stats_history)
+
+    nodes_list = list(graph.nodes())
+    data_js = f"""
+        const data = {payload["scene_json"]};
+        const stats = {payload["stats_json"]};
+        const STATES = {json.dumps(REPLAY_STATES)};
+        const packed = Uint8Array.from(atob("{_encode_history(nodes_list, history)}"), c => c.charCodeAt(0));
+        const inflated = new Uint8Array(await new Response(
+            new Blob([packed]).stream().pipeThrough(new DecompressionStream('deflate'))
+        ).arrayBuffer());
+        const history = [];
+        for (let off = 0; off < inflated.length; off += data.nodes.length) {{
+            history.push(Array.from(inflated.subarray(off, off + data.nodes.length), c => STATES[c]));
+        }}
+    """
+
+    if library_src is None:
+        library_tag = f"<script>{THREE_JS_PATH.read_text(encoding='utf-8')}</script>"
+    else:
+        library_tag = f'<script src="{library_src}"></script>'
+
+    body = _scene_html(payload["key"], "100vh", False, OFFLINE_MODULE_HEADER, data_js)
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>NetworkSim Replay</title>
+    <style>html, body {{ margin: 0; background: #0c1625; }}</style>
+    {library_tag}
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+    if path is not None:
+        Path(path).write_text(html, encoding='utf-8')
     return html
\ No newline at end of file